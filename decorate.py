@@ -81,9 +81,12 @@ class MonitoringPlugins:
             for name, plugin_path in plugins_per_level.items():
                 start_time = time.time()
                 self.logger.debug(
-                    f"🎄Decorate {name} (per-{plugin_level}) "
-                    f"on {os.path.basename(self.input_file)} "
-                    f"({plugin_path} on {self.input_file})."
+                    "🎄Decorate %s (per-%s) on %s (%s on %s).",
+                    name,
+                    plugin_level,
+                    os.path.basename(self.input_file),
+                    plugin_path,
+                    self.input_file,
                 )
                 self.shoot_by_name(plugin_path)
                 self.times.append(
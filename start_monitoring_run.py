@@ -5,15 +5,20 @@ import concurrent.futures
 import configparser
 import datetime
 import enum
-import glob
+import functools
+import heapq
 import importlib.util
+import json
 import logging
+import math
 import os
 import queue
+import re
 import shutil
 import subprocess
 import sys
 import tarfile
+import tempfile
 import threading
 import time
 
@@ -42,6 +47,50 @@ quality_info = import_from(
     os.path.join(repo_root, "continuous_event_building", "quality_info.py")
 )
 
+try:
+    import watchdog.events
+    import watchdog.observers
+
+    class RawFolderEventHandler(watchdog.events.FileSystemEventHandler):
+        """Scan the raw run folder as soon as the DAQ has added a relevant file."""
+
+        def __init__(self, monitoring, job_queue):
+            super().__init__()
+            self.monitoring = monitoring
+            self.job_queue = job_queue
+
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            if event.event_type not in ["created", "moved", "closed"]:
+                return
+            path = getattr(event, "dest_path", "") or event.src_path
+            name = without_tar(os.path.basename(path))
+            if name != "hitsHistogram.txt" and raw_part_id(name) is None:
+                return
+            try:
+                self.monitoring._look_for_new_raw(self.job_queue, force=True)
+            except Exception as e:
+                # Keep the observer thread alive; the workers re-raise the error.
+                self.monitoring.logger.exception(e)
+                self.monitoring._watcher_error = e
+
+    def start_raw_folder_watcher(monitoring, job_queue):
+        observer = watchdog.observers.Observer()
+        handler = RawFolderEventHandler(monitoring, job_queue)
+        observer.schedule(handler, monitoring.raw_run_folder, recursive=False)
+        observer.start()
+        return observer
+
+except ImportError as e:
+    no_watchdog_txt = "👀The raw run folder will be polled for new files. "
+    no_watchdog_txt += str(e)
+    print(no_watchdog_txt)
+
+    def start_raw_folder_watcher(monitoring, job_queue):
+        return None
+
+
 file_paths = dict(
     run_settings="Run_Settings.txt",
     default_config="monitoring.cfg",
@@ -58,6 +107,7 @@ monitoring_subfolders = dict(
 )
 file_paths.update(**monitoring_subfolders)
 my_paths = collections.namedtuple("Paths", file_paths.keys())(**file_paths)
+root_batch_cmd = ("root", "-b", "-l", "-q")
 
 
 def as_tar(path):
@@ -74,6 +124,13 @@ def without_tar(path):
     return path
 
 
+def raw_part_id(name):
+    """The id_dat XXXX of a raw part named `*_XXXX`, else None."""
+    if name[-5:-4] != "_" or not name[-4:].isdigit():
+        return None
+    return int(name[-4:])
+
+
 def get_now_string():
     return datetime.datetime.now().strftime("%Y-%m-%d-%H%M%S")
 
@@ -93,6 +150,147 @@ class Priority(enum.IntEnum):
     IDLE = 5
 
 
+class JobHeap:
+    """Priority queue for the monitoring jobs.
+
+    Covers the parts of `queue.PriorityQueue` that the monitoring uses,
+    but with a single condition variable and a thread-safe peek.
+    `maxsize` does not block `put`: it is up to the producer to check the `room`.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._h = []
+        self._cv = threading.Condition()
+        self._unfinished_tasks = 0
+
+    def put(self, item):
+        with self._cv:
+            heapq.heappush(self._h, item)
+            self._unfinished_tasks += 1
+            self._cv.notify()
+
+    def put_many(self, items):
+        """Like `put` for each item, but with a single heapify and lock."""
+        if not items:
+            return
+        with self._cv:
+            self._h.extend(items)
+            heapq.heapify(self._h)
+            self._unfinished_tasks += len(items)
+            self._cv.notify(len(items))
+
+    def get(self, timeout=None):
+        with self._cv:
+            if not self._cv.wait_for(lambda: self._h, timeout):
+                raise queue.Empty
+            return heapq.heappop(self._h)
+
+    def peek_priority(self):
+        with self._cv:
+            return self._h[0][0] if self._h else None
+
+    def empty(self):
+        with self._cv:
+            return not self._h
+
+    def qsize(self):
+        with self._cv:
+            return len(self._h)
+
+    def room(self):
+        """Number of items that still fit in before reaching `maxsize`."""
+        with self._cv:
+            if self.maxsize <= 0:
+                return math.inf
+            return max(0, self.maxsize - len(self._h))
+
+    def task_done(self):
+        with self._cv:
+            if self._unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self._unfinished_tasks -= 1
+            if self._unfinished_tasks == 0:
+                self._cv.notify_all()
+
+    def join(self):
+        with self._cv:
+            self._cv.wait_for(lambda: self._unfinished_tasks == 0)
+
+
+class RootSession:
+    """A long-lived `root -b -l` interpreter, so that ROOT only starts once.
+
+    Macros are loaded on their first use. Each `run` returns the same
+    kind of CompletedProcess as `subprocess.run("root -b -l -q ...")`,
+    with the output of this call only.
+    After `max_runs` calls, the session should be replaced by a fresh one,
+    so that state left behind by the macros does not pile up.
+    """
+
+    _done_marker = ("monitoring_root_session_", "done")
+    max_runs = 20
+
+    def __init__(self, cwd):
+        self.n_runs = 0
+        self._loaded_macros = set()
+        self._stderr = tempfile.TemporaryFile()
+        self._stderr_pos = 0
+        self._process = subprocess.Popen(
+            ["root", "-b", "-l"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            cwd=cwd,
+        )
+
+    def run(self, macro, macro_args):
+        self.n_runs += 1
+        commands = []
+        if macro not in self._loaded_macros:
+            commands.append(f".L {macro}")
+            self._loaded_macros.add(macro)
+        commands.append(f"{os.path.splitext(macro)[0]}({macro_args});")
+        # Flush the C stdio buffers too, as the macros may also use printf.
+        commands.append("fflush(stdout); fflush(stderr);")
+        # Split in two, so that an echo of the command is not taken as the marker.
+        commands.append(
+            'std::cout << "{}" << "{}" << std::endl;'.format(*self._done_marker)
+        )
+        done_marker = "".join(self._done_marker).encode()
+        stdout = collections.deque(maxlen=1000)
+        returncode = None
+        try:
+            self._process.stdin.write(("\n".join(commands) + "\n").encode())
+            self._process.stdin.flush()
+            for line in self._process.stdout:
+                if done_marker in line:
+                    returncode = 0
+                    break
+                stdout.append(line)
+        except BrokenPipeError:
+            pass
+        if returncode is None:
+            # The interpreter has quit before reaching the end of the commands.
+            returncode = self._process.wait() or 1
+        stderr_end = os.fstat(self._stderr.fileno()).st_size
+        stderr = os.pread(
+            self._stderr.fileno(), stderr_end - self._stderr_pos, self._stderr_pos
+        )
+        self._stderr_pos = stderr_end
+        return subprocess.CompletedProcess(
+            self._process.args, returncode, b"".join(stdout), stderr
+        )
+
+    def close(self):
+        try:
+            self._process.communicate(b".q\n", timeout=10)
+        except (BrokenPipeError, subprocess.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        self._stderr.close()
+
+
 def priority_string(prios):
     chars = []
     for prio in prios:
@@ -164,8 +362,9 @@ def cleanup_temporary(output_dir, logger, input_dir):
 
     tmp_dir = os.path.join(output_dir, my_paths.tmp_dir)
     if os.path.isdir(tmp_dir):
-        for tmp_file in os.listdir(tmp_dir):
-            os.remove(os.path.join(tmp_dir, tmp_file))
+        with os.scandir(tmp_dir) as it:
+            for entry in it:
+                os.unlink(entry.path)
 
 
 def git_repo_status():
@@ -228,36 +427,88 @@ def log_unexpected_error_subprocess(logger, subprocess_return, add_context=""):
     )
 
 
+def run_with_stdout_log(cmd, log_path, tail_size=1 << 15, **kwargs):
+    """`subprocess.run`, but the stdout goes to `log_path` instead of memory.
+
+    On success the log is removed. On failure the log is kept, and its tail
+    is read back into the returned `stdout` for `log_unexpected_error_subprocess`.
+    """
+    with open(log_path, "wb") as log:
+        ret = subprocess.run(cmd, stdout=log, stderr=subprocess.PIPE, **kwargs)
+    if ret.returncode == 0 and ret.stderr == b"":
+        os.remove(log_path)
+        return ret
+    with open(log_path, "rb") as log:
+        log_size = os.fstat(log.fileno()).st_size
+        ret.stdout = os.pread(log.fileno(), tail_size, max(0, log_size - tail_size))
+    return ret
+
+
+env_stamp_file = os.path.join(os.path.expanduser("~"), ".cache", "siwecal_env.json")
+
+
+def probe_computing_environment(root_path, py_path):
+    """The `python --version` output.
+
+    The result is kept in a stamp file. `python` is only run again if the
+    `root` or `python` executables have changed.
+    """
+    return _probe_env(
+        root_path=root_path,
+        root_mtime=os.path.getmtime(root_path),
+        py_path=py_path,
+        py_mtime=os.path.getmtime(py_path),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_env(root_path, root_mtime, py_path, py_mtime):
+    stamp = dict(
+        root_path=root_path,
+        root_mtime=root_mtime,
+        py_path=py_path,
+        py_mtime=py_mtime,
+    )
+    try:
+        with open(env_stamp_file) as f:
+            cached_stamp = json.load(f)
+        if {k: cached_stamp.get(k) for k in stamp} == stamp:
+            return cached_stamp["py_version"]
+    except (OSError, ValueError, KeyError):
+        pass
+    ret = subprocess.run([py_path, "--version"], capture_output=True)
+    # Python2 writes version info to sys.stderr, Python3 to sys.stdout.
+    stamp["py_version"] = (ret.stdout + ret.stderr).decode()
+    try:
+        os.makedirs(os.path.dirname(env_stamp_file), exist_ok=True)
+        with open(env_stamp_file, "w") as f:
+            json.dump(stamp, f)
+    except OSError:
+        pass
+    return stamp["py_version"]
+
+
+_RUN_RE = re.compile(r"run_(\d+)", re.IGNORECASE)
+_DIGIT_RE = re.compile(r"\d+")
+
+
 def guess_id_run(name, output_parent):
     """Ideally takes the number following `run_`. Else constructs a id_run."""
     # Best-case scenario: Find a number after the string `run_`.
-    pos_run_prefix = name.lower().find("run_")
-    if pos_run_prefix != -1:
-        idx_start_number = pos_run_prefix + len("run_")
-        if len(name) >= idx_start_number and name[idx_start_number].isdigit():
-            for idx_end_number in range(idx_start_number, len(name)):
-                if not name[idx_end_number].isdigit():
-                    break
-            else:
-                idx_end_number += 1
-            return int(name[idx_start_number:idx_end_number])
+    run_number = _RUN_RE.search(name)
+    if run_number:
+        return int(run_number.group(1))
 
     # Next try: find the longest (then largest) number-string of at least length 3.
-    numbers = [""]
-    for s in name:
-        if s.isdigit():
-            numbers[-1] = numbers[-1] + s
-        elif numbers[-1] != "":
-            numbers.append("")
-    longest_number = max(map(len, numbers))
+    numbers = _DIGIT_RE.findall(name)
+    longest_number = max(map(len, numbers), default=0)
     if longest_number >= 3:
         longest_numbers = (n for n in numbers if len(n) == longest_number)
         return max(map(int, longest_numbers))
 
     # Last resort: Use the number of monitored runs as id_run.
-    return sum(
-        os.path.isdir(os.path.join(output_parent, d)) for d in os.listdir(output_parent)
-    )
+    with os.scandir(output_parent) as it:
+        return sum(1 for entry in it if entry.is_dir(follow_symlinks=False))
 
 
 class EcalMonitoring:
@@ -265,6 +516,8 @@ class EcalMonitoring:
         setup_time = time.time()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.raw_run_folder = self._validate_raw_run_folder(raw_run_folder)
+        self._raw_base = self.raw_run_folder + os.sep
+        self._file_run_finished = self._raw_base + "hitsHistogram.txt"
         self._validate_computing_environment()
         self._read_config(config_file)
         masking_time = time.time()
@@ -291,6 +544,12 @@ class EcalMonitoring:
                 data_path=self.output_dir,
             )
         )
+        # With stdout going to a log file, printing the progress info makes no sense.
+        self.eventbuilding_args["no_progress_info"] = "True"
+        # Only the paths and id_dat change from one eventbuilding job to the next.
+        self._eventbuilding_static_cmd = []
+        for k, v in self.eventbuilding_args.items():
+            self._eventbuilding_static_cmd += [f"--{k}", str(v)]
 
     def _validate_raw_run_folder(self, raw_run_folder):
         # Removes potential trailing backslash.
@@ -311,14 +570,17 @@ class EcalMonitoring:
             f"try an LCG view (adapt `{a_platform}` for your OS) "
             f"\nsource /cvmfs/sft.cern.ch/lcg/views/LCG_101/{a_platform}/setup.sh"
         )
+        root_path = shutil.which("root")
+        if root_path is None:
+            self.logger.error(
+                "⛔Aborted. CERN root not available. " + recommended_cvmfs_hint
+            )
+            sys.exit(1)
         env_py_v = ""
         try:
             # This is not necessarily the python that runs this script, but
             # the one that will run the eventbuilding (and is linked with ROOT).
-            ret = subprocess.run(["python", "--version"], capture_output=True)
-            # Python2 writes version info to sys.stderr, Python3 to sys.stderr.
-            env_py_v = ret.stdout + ret.stderr
-            env_py_v = env_py_v.decode()
+            env_py_v = probe_computing_environment(root_path, shutil.which("python"))
             assert env_py_v.startswith("Python ") and env_py_v.endswith("\n"), env_py_v
             env_py_v = env_py_v[:-1]
             py_v_list = list(map(int, env_py_v[len("Python ") :].split(".")))
@@ -337,13 +599,6 @@ class EcalMonitoring:
                 " " + recommended_cvmfs_hint
             )
             sys.exit(1)
-        try:
-            subprocess.run(["root", "--version"], capture_output=True)
-        except FileNotFoundError:
-            self.logger.error(
-                "⛔Aborted. CERN root not available. " + recommended_cvmfs_hint
-            )
-            sys.exit(1)
 
     def _read_config(self, config_file):
         if not os.path.isabs(config_file):
@@ -366,21 +621,20 @@ class EcalMonitoring:
         if os.path.exists(self.output_dir) and len(os.listdir(self.output_dir)) > 0:
             cleanup_temporary(self.output_dir, self.logger, self.raw_run_folder)
         create_directory_structure(self.output_dir)
+        # Path prefixes for the per-file paths in the job hot paths.
+        self._converted_base = os.path.join(self.output_dir, my_paths.converted_dir)
+        self._converted_base += os.sep
+        self._build_base = os.path.join(self.output_dir, my_paths.build_dir) + os.sep
+        self._tmp_base = os.path.join(self.output_dir, my_paths.tmp_dir) + os.sep
         configure_logging(self.logger, os.path.join(self.output_dir, my_paths.log_file))
         self.max_workers = int(get_with_fallback("monitoring", "max_workers", "10"))
         assert self.max_workers >= 1, self.max_workers
         self._skip_dirty_dat = config["monitoring"].getboolean("skip_dirty_dat", False)
         self._binary_split_M = config["monitoring"].getint("binary_split_M", -1)
         self._quality_info = config["monitoring"].getboolean("quality_info", True)
+        self._root_sessions = config["monitoring"].getboolean("root_sessions", False)
 
         ev_building = config["eventbuilding"]
-
-        def ensure_calibration_exists(calib):
-            file = os.path.abspath(ev_building.get(calib))
-            assert os.path.exists(file), file
-            ev_building[calib] = file
-            return file
-
         self.eventbuilding_args = dict()
         self.eventbuilding_args["config_file"] = config_file
         calibration_fields = [
@@ -392,8 +646,14 @@ class EcalMonitoring:
         for optional_calib in ["mapping_file", "mapping_file_cob"]:
             if optional_calib in ev_building:
                 calibration_fields.append(optional_calib)
-        for calib in calibration_fields:
-            self.eventbuilding_args[calib] = ensure_calibration_exists(calib)
+        calib_files = [os.path.abspath(ev_building.get(c)) for c in calibration_fields]
+        # The stats are slow on network file systems: run them side by side.
+        with concurrent.futures.ThreadPoolExecutor(len(calib_files)) as executor:
+            calib_exists = list(executor.map(os.path.exists, calib_files))
+        for calib, file, exists in zip(calibration_fields, calib_files, calib_exists):
+            assert exists, file
+            ev_building[calib] = file
+            self.eventbuilding_args[calib] = file
         if "id_run" not in ev_building:
             ev_building["id_run"] = str(guess_id_run(output_name, output_parent))
         self.eventbuilding_args["id_run"] = ev_building.getint("id_run")
@@ -432,30 +692,43 @@ class EcalMonitoring:
             )
         tmp_rs_name = os.path.splitext(tmp_run_settings)[0]
         root_macro_dir = os.path.join(my_paths.tb_analysis_dir, "SLBcommissioning")
-        root_call = f'"test_read_masked_channels_summary.C(\\"{tmp_rs_name}\\")"'
-        ret = subprocess.run(
-            "root -b -l -q " + root_call,
-            shell=True,
-            capture_output=True,
-            cwd=root_macro_dir,
-        )
-        output_lines = ret.stdout.split(b"\n")
+        root_call = f'test_read_masked_channels_summary.C("{tmp_rs_name}")'
         # Reading error as indicated by the root macro's output.
         root_macro_issue_stdout = b" dameyo - damedame"
-        settings_file_not_read = output_lines[2] == root_macro_issue_stdout
+        root_macro_issue_line = root_macro_issue_stdout + b"\n"
+        settings_file_not_read = False
+        issue_in_other_line = False
+        stdout_tail = collections.deque(maxlen=100)
+        with tempfile.TemporaryFile() as stderr, subprocess.Popen(
+            [*root_batch_cmd, root_call],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            cwd=root_macro_dir,
+        ) as proc:
+            for i, line in enumerate(proc.stdout):
+                # Compare as-is: the last line might come without a newline.
+                if line in (root_macro_issue_line, root_macro_issue_stdout):
+                    if i == 2:
+                        settings_file_not_read = True
+                    else:
+                        issue_in_other_line = True
+                stdout_tail.append(line)
+            returncode = proc.wait()
+            stderr.seek(0)
+            ret = subprocess.CompletedProcess(
+                proc.args, returncode, b"".join(stdout_tail), stderr.read()
+            )
         if ret.returncode != 0 or settings_file_not_read:
             log_unexpected_error_subprocess(self.logger, ret, " during create_masking")
             sys.exit(1)
-        assert not any(
-            [line == root_macro_issue_stdout for line in output_lines]
-        ), "This condition should be unreachable."
+        assert not issue_in_other_line, "This condition should be unreachable."
         masked_channels = os.path.join(self.output_dir, my_paths.masked_channels)
         os.rename(
             os.path.join(self.output_dir, tmp_rs_name + "_masked.txt"),
             masked_channels,
         )
         os.remove(tmp_run_settings)
-        self.logger.debug(f"👏Channel masks written to {masked_channels}")
+        self.logger.debug("👏Channel masks written to %s", masked_channels)
         self.eventbuilding_args["masked_file"] = masked_channels
         return masked_channels
 
@@ -465,23 +738,37 @@ class EcalMonitoring:
         self._last_n_monitored = 0
         self._new_merged = False
         self._snapshot_needs_current_build = False
-        self._run_finished = False
+        self._run_finished = threading.Event()
+        self._raw_backlog = False
+        self._watcher_error = None
         self._time_last_raw_check = 0
         self._time_last_snapshot = time.time()
         self._time_last_job = time.time()
+        self._n_idle_infos = 1
+        self._state_lock = threading.Lock()
         self._current_jobs = [Priority.IDLE for _ in range(self.max_workers)]
         queues = {}
-        queues["job"] = queue.PriorityQueue()
+        queues["job"] = JobHeap(maxsize=4 * self.max_workers)
         current_build = os.path.join(self.output_dir, my_paths.current_build)
         queues["current_build"] = queue.Queue(maxsize=1)
         queues["current_build"].put(current_build)
         queues["merge"] = queue.LifoQueue()
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = []
-            for i in range(self.max_workers):
-                job_args = [queues, i]
-                futures.append(executor.submit(self.find_and_do_job, *job_args))
-                time.sleep(1)  # Head start for the startup bookkeeping.
+        self._converter_sessions = queue.SimpleQueue()
+        self._raw_scan_lock = threading.Lock()
+        raw_folder_watcher = start_raw_folder_watcher(self, queues["job"])
+        self._watch_raw_folder = raw_folder_watcher is not None
+        if self._watch_raw_folder:
+            # Pick up the files that were written before the watcher started.
+            self._look_for_new_raw(queues["job"], force=True)
+        # Before any worker starts: A conversion finished in the meantime would
+        # otherwise be scheduled for event building twice.
+        self._check_for_missing_builds(queues["job"])
+        # One thread per worker: The workers run until the end of the monitoring.
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            futures = [
+                executor.submit(self.find_and_do_job, queues, i)
+                for i in range(self.max_workers)
+            ]
             if self._quality_info:
                 while not all(e.done() for e in futures):
                     if self._new_merged:
@@ -493,8 +780,13 @@ class EcalMonitoring:
                         )
                         if not no_timeout:
                             self._new_merged = True
-                    time.sleep(1)
+                    concurrent.futures.wait(futures, timeout=1)
             self._debug_future_returns(futures, queues)
+        if self._watch_raw_folder:
+            raw_folder_watcher.stop()
+            raw_folder_watcher.join()
+        while not self._converter_sessions.empty():
+            self._converter_sessions.get().close()
         wrap_up_time = time.time()
         self.times[-1].append(
             Timer(
@@ -570,20 +862,21 @@ class EcalMonitoring:
         self.times[i_worker] = []
         threading.current_thread().name = f"👷{i_worker:02}"
         job_queue = queues["job"]
-        if i_worker == 0:
-            self._check_for_missing_builds(job_queue)
         total_time_look_for_jobs = 0
         total_time_idle = 0
         while True:
+            if self._watcher_error is not None:
+                raise self._watcher_error
             time_look_for_jobs = time.time()
             self._look_for_snapshot_request(job_queue)
-            # The try is not technically thread safe, but good enough here.
-            try:
-                assert job_queue.queue[0][0] < Priority.CONVERSION
-            except (IndexError, AssertionError):
-                self._look_for_new_raw(job_queue)
-
-            all_done = self._run_finished and job_queue.empty()
+            # With the watcher, new raw files are put on the job_queue directly,
+            # unless a full job_queue made the last scan leave some behind.
+            if not self._watch_raw_folder or self._raw_backlog:
+                next_priority = job_queue.peek_priority()
+                if next_priority is None or next_priority >= Priority.CONVERSION:
+                    self._look_for_new_raw(job_queue)
+
+            all_done = self._run_finished.is_set() and job_queue.empty()
             file_stop_gracefully = os.path.join(self.output_dir, "stop_monitoring")
             if all_done or os.path.exists(file_stop_gracefully):
                 if self._binary_split_M > 0 and all_done:
@@ -624,6 +917,15 @@ class EcalMonitoring:
             try:
                 priority, neg_id_dat, in_file = job_queue.get(timeout=2)
             except queue.Empty:
+                self._current_jobs[i_worker] = Priority.IDLE
+                if self._watch_raw_folder and not self._run_finished.is_set():
+                    # Fallback in case the watcher stopped or missed a file.
+                    self._look_for_new_raw(job_queue)
+                    self._alert_is_idle()
+                continue
+            if priority == Priority.IDLE:
+                # Wake-up call after the end of the run: Re-check `all_done`.
+                job_queue.task_done()
                 self._current_jobs[i_worker] = Priority.IDLE
                 continue
             time_do_job = time.time()
@@ -661,12 +963,15 @@ class EcalMonitoring:
             else:
                 raise NotImplementedError(priority)
             job_queue.task_done()
-            self._time_last_job = time.time()
+            self._current_jobs[i_worker] = Priority.IDLE
+            # Keep a local copy: The attribute is shared by all workers.
+            time_job_done = time.time()
+            self._time_last_job = time_job_done
             if res_file:
                 self.times[i_worker].append(
                     Timer(
                         job_type=priority.name,
-                        time=self._time_last_job - time_do_job,
+                        time=time_job_done - time_do_job,
                         timestamp=get_now_string(),
                         id=-neg_id_dat,
                         worker=i_worker,
@@ -674,15 +979,15 @@ class EcalMonitoring:
                     )
                 )
             else:
-                total_time_idle += self._time_last_job - time_do_job
+                total_time_idle += time_job_done - time_do_job
 
     def _check_for_missing_builds(self, job_queue):
         conv_dir = os.path.join(self.output_dir, my_paths.converted_dir)
         for conv_part in os.listdir(conv_dir):
             name = conv_part.replace("converted_", "build")
-            if os.path.exists(os.path.join(self.output_dir, my_paths.tmp_dir, name)):
+            if os.path.exists(self._tmp_base + name):
                 continue
-            if os.path.exists(os.path.join(self.output_dir, my_paths.build_dir, name)):
+            if os.path.exists(self._build_base + name):
                 continue
             conv_path = os.path.join(conv_dir, conv_part)
             if "_monitoring_split_" in conv_part:
@@ -698,75 +1003,117 @@ class EcalMonitoring:
             job_queue.put((Priority.EVENT_BUILDING, -id_job, conv_path))
         return True
 
-    def _look_for_new_raw(self, job_queue):
-        if self._run_finished:
+    def _look_for_new_raw(self, job_queue, force=False):
+        # Forced scans (e.g. from the watcher) must not be lost. Otherwise, if
+        # another worker is already scanning, there is nothing left to do here.
+        if not self._raw_scan_lock.acquire(blocking=force):
+            return
+        try:
+            self._look_for_new_raw_unlocked(job_queue, force)
+        finally:
+            self._raw_scan_lock.release()
+
+    def _look_for_new_raw_unlocked(self, job_queue, force=False):
+        if self._run_finished.is_set():
             return
         delta_t_daq_output_checks = 2  # in seconds.
-        if time.time() - self._time_last_raw_check < delta_t_daq_output_checks:
-            if job_queue.empty():
-                time.sleep(delta_t_daq_output_checks)
+        time_since_last_check = time.time() - self._time_last_raw_check
+        if time_since_last_check < delta_t_daq_output_checks and not force:
+            # Idle workers wait in `job_queue.get` instead, and are woken up by `put`.
             return
         self._time_last_raw_check = time.time()
-        dat_pattern = os.path.join(self.raw_run_folder, "*.dat_[0-9][0-9][0-9][0-9]")
-        dat_files = sorted(glob.glob(dat_pattern))
-        if len(dat_files) == 0:
-            dat_from_tar = glob.glob(dat_pattern + ".tar.gz")
-            dat_files.extend(sorted(map(without_tar, dat_from_tar)))
-        if len(dat_files) != 0:
-            path_start = dat_files[-1][:-4]
-            new_largest_dat = int(dat_files[-1][-4:])
-            for i in range(self._largest_raw_dat, new_largest_dat):
-                path = path_start + f"{i:04}"
-                if os.path.exists(as_tar(path)):
-                    job_queue.put((Priority.CONVERSION, -i, path))
-            self._largest_raw_dat = new_largest_dat
+        dat_parts = self._scan_new_raw_parts(".dat")
+        if len(dat_parts) != 0:
+            self._enqueue_raw_parts(dat_parts, job_queue)
             self._special_case_0000(job_queue, ".dat")
-        file_run_finished = as_tar(
-            os.path.join(self.raw_run_folder, "hitsHistogram.txt")
-        )
-        self._run_finished = os.path.exists(file_run_finished)
-        self._check_for_binary(dat_files, job_queue)
-        if self._run_finished:
-            if len(dat_files) > 0:
-                job_queue.put((Priority.CONVERSION, -new_largest_dat, dat_files[-1]))
+        self._check_for_binary(dat_parts, job_queue)
+        file_run_finished = as_tar(self._file_run_finished)
+        # With a backlog, the run is only finished once all parts are scheduled.
+        if os.path.exists(file_run_finished) and not self._raw_backlog:
+            if len(dat_parts) > 0:
+                new_largest_dat = max(dat_parts)
+                last_dat = dat_parts[new_largest_dat]
+                job_queue.put((Priority.CONVERSION, -new_largest_dat, last_dat))
             else:
                 self._special_case_0000(job_queue, ".dat")
                 self._special_case_0000(job_queue, "_raw.bin")
+            # Only now: No worker may stop before the last jobs are on the queue.
+            self._run_finished.set()
             self.logger.info(
                 "🏃The run has finished. " "Monitoring will try to catch up now."
             )
-        self._alert_is_idle(file_run_finished)
+            # Sentinels: Sorted after all real jobs, they wake up the idle workers.
+            for _ in range(self.max_workers):
+                job_queue.put((Priority.IDLE, 0, "not used"))
+        if not self._watch_raw_folder:
+            self._alert_is_idle()
+
+    def _scan_new_raw_parts(self, ext):
+        """Map id_dat -> path for the raw parts `*{ext}_XXXX` in the run folder.
+
+        For `_raw.bin`, the parts `*_raw.bin*_XXXX` are accepted as well.
+        Only parts from `self._largest_raw_dat` onwards are returned.
+        Compressed parts are returned by their path without `.tar.gz`.
+        """
+        new_parts = {}
+        with os.scandir(self.raw_run_folder) as it:
+            for entry in it:
+                name = without_tar(entry.name)
+                id_dat = raw_part_id(name)
+                if id_dat is None:
+                    continue
+                if ext == ".dat" and not name[:-5].endswith(ext):
+                    continue
+                if ext not in name[:-5]:
+                    continue
+                if id_dat >= self._largest_raw_dat:
+                    new_parts[id_dat] = self._raw_base + name
+        return new_parts
 
-    def _check_for_binary(self, dat_files, job_queue):
+    def _check_for_binary(self, dat_parts, job_queue):
         bin_ext = "_raw.bin"
-        bin_pattern = "*" + bin_ext + "*_[0-9][0-9][0-9][0-9]"
-        bin_pattern = os.path.join(self.raw_run_folder, bin_pattern)
-        binary_parts = sorted(glob.glob(bin_pattern))
-        if len(binary_parts) == 0:
-            binary_from_tar = glob.glob(bin_pattern + ".tar.gz")
-            binary_parts.extend(sorted(map(without_tar, binary_from_tar)))
-        if len(dat_files) > 0 and len(binary_parts) > 0:
+        binary_parts = self._scan_new_raw_parts(bin_ext)
+        if len(dat_parts) > 0 and len(binary_parts) > 0:
             self.logger.error(
                 "⛔ Cannnot have both ascii data and raw_bin data in same run! "
-                f"{dat_files} {binary_parts}"
+                f"{sorted(dat_parts.values())} {sorted(binary_parts.values())}"
             )
         if len(binary_parts) > 0:
-            path_start = binary_parts[-1][:-4]
-            new_largest_dat = int(binary_parts[-1][-4:])
-            for i in range(self._largest_raw_dat, new_largest_dat):
-                path = path_start + f"{i:04}"
-                if os.path.exists(as_tar(path)):
-                    job_queue.put((Priority.CONVERSION, -i, path))
-            self._largest_raw_dat = new_largest_dat
+            self._enqueue_raw_parts(binary_parts, job_queue)
             self._special_case_0000(job_queue, bin_ext)
 
+    def _enqueue_raw_parts(self, raw_parts, job_queue):
+        """Schedule the conversion of all but the newest (still written) raw part.
+
+        Stops early if the job_queue is full. Then `_largest_raw_dat` is the first
+        part that was left behind, so that the next scan starts from there.
+        """
+        new_largest_dat = max(raw_parts)
+        room = job_queue.room()
+        new_jobs = []
+        for i in range(self._largest_raw_dat, new_largest_dat):
+            if len(new_jobs) >= room:
+                self._largest_raw_dat = i
+                self._raw_backlog = True
+                break
+            if i in raw_parts:
+                new_jobs.append((Priority.CONVERSION, -i, raw_parts[i]))
+        else:
+            self._largest_raw_dat = new_largest_dat
+            self._raw_backlog = False
+        job_queue.put_many(new_jobs)
+
     def _special_case_0000(self, job_queue, pattern=".dat"):
         if hasattr(self, "_already_done_0000"):
             return False
-        first_dat_pattern = os.path.join(self.raw_run_folder, "*" + pattern)
-        first_dat_glob = list(glob.glob(first_dat_pattern))
+        first_dat_glob, first_dat_from_tar = [], []
+        with os.scandir(self.raw_run_folder) as it:
+            for entry in it:
+                if entry.name.endswith(pattern):
+                    first_dat_glob.append(self._raw_base + entry.name)
+                elif entry.name.endswith(pattern + ".tar.gz"):
+                    first_dat_from_tar.append(self._raw_base + entry.name)
         if len(first_dat_glob) == 0:
-            first_dat_from_tar = list(glob.glob(first_dat_pattern + ".tar.gz"))
             first_dat_glob.extend(sorted(map(without_tar, first_dat_from_tar)))
         if len(first_dat_glob) == 0:
             return False
@@ -774,11 +1121,9 @@ class EcalMonitoring:
             raw_file_path = first_dat_glob[0]
             raw_file_name = os.path.basename(raw_file_path)
             converted_name = "converted_" + raw_file_name + "_0000.root"
-            converted_dir = os.path.join(self.output_dir, my_paths.converted_dir)
-            tmp_dir = os.path.join(self.output_dir, my_paths.tmp_dir)
-            if os.path.exists(os.path.join(converted_dir, converted_name)):
+            if os.path.exists(self._converted_base + converted_name):
                 return False
-            if os.path.exists(os.path.join(tmp_dir, converted_name)):
+            if os.path.exists(self._tmp_base + converted_name):
                 return False
             elif os.path.exists(as_tar(raw_file_path)):
                 self._already_done_0000 = True
@@ -808,12 +1153,14 @@ class EcalMonitoring:
         if schedule_snapshot:
             job_queue.put((Priority.SNAP_SHOT, 0, "not used"))
 
-    def _alert_is_idle(self, file_run_finished, seconds_before_alert=60):
+    def _alert_is_idle(self, seconds_before_alert=60):
         time_without_jobs = time.time() - self._time_last_job
-        n_idle_infos = getattr(self, "_n_idle_infos", 1)
-        if time_without_jobs < seconds_before_alert * n_idle_infos:
-            return
-        self._n_idle_infos = n_idle_infos + 1
+        # Check and count under the lock, so that only one worker gives the alert.
+        with self._state_lock:
+            if time_without_jobs < seconds_before_alert * self._n_idle_infos:
+                return
+            self._n_idle_infos += 1
+        file_run_finished = as_tar(self._file_run_finished)
 
         file_suppress_idle_info = os.path.join(self.output_dir, "suppress_idle_info")
         if os.path.exists(file_suppress_idle_info):
@@ -836,53 +1183,59 @@ class EcalMonitoring:
         raw_file_path = as_tar(raw_file_path)
         if self._skip_dirty_dat:
             if os.path.getsize(raw_file_path) < 1024:
-                self.logger.debug("🦘Skip empty dat file: " + raw_file_path)
+                self.logger.debug("🦘Skip empty dat file: %s", raw_file_path)
                 return False
         if raw_file_name.endswith(".dat") or raw_file_name.endswith("raw.bin"):
             converted_name = "converted_" + raw_file_name + "_0000.root"
         else:
             converted_name = "converted_" + raw_file_name + ".root"
-        out_path = os.path.join(self.output_dir, my_paths.converted_dir, converted_name)
+        out_path = self._converted_base + converted_name
         if os.path.exists(out_path):
             return out_path
-        tmp_dir = os.path.join(self.output_dir, my_paths.tmp_dir)
-        tmp_path = os.path.join(tmp_dir, converted_name)
+        tmp_path = self._tmp_base + converted_name
         if raw_file_path.endswith(".tar.gz"):
             with tarfile.open(raw_file_path) as tar:
-                tar.extractall(path=tmp_dir)
-            in_path = os.path.join(tmp_dir, raw_file_name)
+                tar.extractall(path=self._tmp_base)
+            in_path = self._tmp_base + raw_file_name
             assert os.path.exists(in_path), in_path
         else:
             in_path = raw_file_path
 
         root_macro_dir = os.path.join(my_paths.tb_analysis_dir, "converter_SLB")
         if "_raw.bin" in raw_file_name:
-            root_call = (
-                f'"RawConvertDataSL.cc(\\"{in_path}\\", false, \\"{tmp_path}\\")"'
-            )
+            macro = "RawConvertDataSL.cc"
             if self._split_binary_too_large(in_path, job_queue):
                 return False
         elif ".dat" in raw_file_name:
-            root_call = f'"ConvertDataSL.cc(\\"{in_path}\\", false, \\"{tmp_path}\\")"'
+            macro = "ConvertDataSL.cc"
         else:
             raise NotImplementedError(raw_file_name)
-        ret = subprocess.run(
-            "root -b -l -q " + root_call,
-            shell=True,
-            capture_output=True,
-            cwd=root_macro_dir,
-        )
+        macro_args = f'"{in_path}", false, "{tmp_path}"'
+        if self._root_sessions:
+            try:
+                session = self._converter_sessions.get_nowait()
+            except queue.Empty:
+                session = RootSession(cwd=root_macro_dir)
+            ret = session.run(macro, macro_args)
+            if session.n_runs < session.max_runs:
+                self._converter_sessions.put(session)
+            else:
+                session.close()
+        else:
+            ret = run_with_stdout_log(
+                [*root_batch_cmd, f"{macro}({macro_args})"],
+                tmp_path + ".log",
+                cwd=root_macro_dir,
+            )
         if ret.returncode != 0 or ret.stderr != b"":
             log_unexpected_error_subprocess(self.logger, ret, " during convert_to_root")
             sys.exit(1)
-        os.rename(tmp_path, out_path)
+        os.replace(tmp_path, out_path)
         if raw_file_path.endswith(".tar.gz"):
             os.remove(in_path)
         elif "_monitoring_split_" in os.path.basename(in_path):
             os.remove(in_path)
-        self.logger.debug(
-            f"🌱New converted file {os.path.basename(out_path)} at {out_path}"
-        )
+        self.logger.debug("🌱New converted file %s at %s", converted_name, out_path)
         return out_path
 
     def _split_binary_too_large(self, binary_path, job_queue):
@@ -893,58 +1246,50 @@ class EcalMonitoring:
         if self._binary_split_M <= 0:
             return False
         if os.path.getsize(binary_path) > 1024**2 * self._binary_split_M:
-            tmp_dir = os.path.join(self.output_dir, my_paths.tmp_dir)
             part_prefix_name = os.path.basename(binary_path) + "_monitoring_split_"
-            part_prefix = os.path.join(tmp_dir, part_prefix_name)
-            if len(glob.glob(part_prefix + "*")) > 0:
+            part_prefix = self._tmp_base + part_prefix_name
+            if self._split_parts(part_prefix_name):
                 # Here the splitting was already done.
                 return True
-            cmd = f"split {binary_path} {part_prefix} "
-            cmd += f"-b {self._binary_split_M}M "
-            cmd += "--suffix-length 5 --numeric "
-            ret = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-            )
+            cmd = ["split", binary_path, part_prefix]
+            cmd += ["-b", f"{self._binary_split_M}M"]
+            cmd += ["--suffix-length", "5", "--numeric"]
+            ret = subprocess.run(cmd, capture_output=True)
             if ret.returncode != 0 or ret.stderr != b"":
                 log_unexpected_error_subprocess(
                     self.logger, ret, " during _split_binary_too_large"
                 )
                 sys.exit(1)
-            for i, binary_part in enumerate(sorted(glob.glob(part_prefix + "*"))):
-                binary_part_path = os.path.join(tmp_dir, binary_part)
+            for i, binary_part_path in enumerate(self._split_parts(part_prefix_name)):
                 id_job = 10000 * binary_id + i
                 job_queue.put((Priority.CONVERSION, -id_job, binary_part_path))
             return True
         return False
 
+    def _split_parts(self, part_prefix_name):
+        """Sorted paths of the split parts `{part_prefix_name}*` in the tmp dir."""
+        with os.scandir(self._tmp_base) as it:
+            names = [e.name for e in it if e.name.startswith(part_prefix_name)]
+        return [self._tmp_base + name for name in sorted(names)]
+
     def run_eventbuilding(self, converted_path, id_dat):
         if self._skip_dirty_dat:
             if os.path.getsize(converted_path) < 1024**2 * 3:
-                self.logger.debug("🦘Skip converted file too small: " + converted_path)
+                self.logger.debug("🦘Skip converted file too small: %s", converted_path)
                 return False
         converted_name = os.path.basename(converted_path)
         build_name = converted_name.replace("converted_", "build_")
-        out_path = os.path.join(self.output_dir, my_paths.build_dir, build_name)
+        out_path = self._build_base + build_name
         if os.path.exists(out_path):
             return out_path
-        tmp_path = os.path.join(self.output_dir, my_paths.tmp_dir, build_name)
-        in_path = os.path.join(self.output_dir, my_paths.converted_dir, converted_name)
+        tmp_path = self._tmp_base + build_name
+        in_path = self._converted_base + converted_name
 
         builder_dir = os.path.join(my_paths.tb_analysis_dir, "eventbuilding")
-        args = f" --converted_path {in_path} --build_path {tmp_path}"
-        self.eventbuilding_args["id_dat"] = int(id_dat)
-        # With `capture_output=True`, printing the progress info makes no sense.
-        self.eventbuilding_args["no_progress_info"] = "True"
-        for k, v in self.eventbuilding_args.items():
-            args += f" --{k} {v}"
-        ret = subprocess.run(
-            "./build_events.py" + args,
-            shell=True,
-            capture_output=True,
-            cwd=builder_dir,
-        )
+        cmd = ["./build_events.py", "--converted_path", in_path]
+        cmd += ["--build_path", tmp_path, "--id_dat", str(int(id_dat))]
+        cmd += self._eventbuilding_static_cmd
+        ret = run_with_stdout_log(cmd, tmp_path + ".log", cwd=builder_dir)
         if ret.returncode != 0 or ret.stderr != b"":
             log_unexpected_error_subprocess(
                 self.logger, ret, " during run_eventbuilding"
@@ -968,7 +1313,7 @@ class EcalMonitoring:
 
     def _single_merge_eventbuilding(self, tmp_path, current_build):
         build_name = os.path.basename(tmp_path)
-        part_path = os.path.join(self.output_dir, my_paths.build_dir, build_name)
+        part_path = self._build_base + build_name
         if os.path.exists(part_path):
             return part_path
         if not os.path.exists(current_build):
@@ -978,12 +1323,10 @@ class EcalMonitoring:
             root_macro_dir = os.path.join(
                 os.path.dirname(os.path.abspath(__file__)), "continuous_event_building"
             )
-            args = '\\"' + '\\", \\"'.join((current_build, tmp_path, "ecal")) + '\\"'
-            root_call = f'"mergeSelective.C({args})"'
-            ret = subprocess.run(
-                "root -b -l -q " + root_call,
-                shell=True,
-                capture_output=True,
+            args = '"' + '", "'.join((current_build, tmp_path, "ecal")) + '"'
+            ret = run_with_stdout_log(
+                [*root_batch_cmd, f"mergeSelective.C({args})"],
+                tmp_path + ".merge.log",
                 cwd=root_macro_dir,
             )
             if ret.returncode != 0 or ret.stderr != b"":
@@ -991,10 +1334,8 @@ class EcalMonitoring:
                     self.logger, ret, " during merge_eventbuilding"
                 )
                 sys.exit(1)
-        os.rename(tmp_path, part_path)
-        self.logger.debug(
-            f"🔨New event file " f"{os.path.basename(part_path)} at {part_path}"
-        )
+        os.replace(tmp_path, part_path)
+        self.logger.debug("🔨New event file %s at %s", build_name, part_path)
 
     def get_snapshot(
         self,
@@ -1013,12 +1354,8 @@ class EcalMonitoring:
             snap_path = os.path.join(self.output_dir, my_paths.snapshot_dir, snap_name)
         else:
             snap_name = os.path.basename(snap_path)
-        tmp_snap_path = os.path.join(
-            self.output_dir, my_paths.tmp_dir, os.path.basename(snap_path)
-        )
-        n_build_parts = len(
-            os.listdir(os.path.join(self.output_dir, my_paths.build_dir))
-        )
+        tmp_snap_path = self._tmp_base + os.path.basename(snap_path)
+        n_build_parts = len(os.listdir(self._build_base))
         if self._last_n_monitored < n_build_parts:
             self._last_n_monitored = n_build_parts
         elif not force_snapshot:
@@ -1040,16 +1377,15 @@ class EcalMonitoring:
             )
         deco_times_file = "times_decorate.py.csv"
         deco_times_file = os.path.join(self.output_dir, ".times", deco_times_file)
-        ret = subprocess.run(
-            f"./decorate.py {tmp_snap_path} --times_file {deco_times_file}",
-            shell=True,
-            capture_output=True,
+        ret = run_with_stdout_log(
+            ["./decorate.py", tmp_snap_path, "--times_file", deco_times_file],
+            tmp_snap_path + ".log",
             cwd=os.path.dirname(os.path.abspath(__file__)),
         )
         if ret.returncode != 0 or ret.stderr != b"":
             log_unexpected_error_subprocess(self.logger, ret, " during get_snapshot")
             sys.exit(1)
-        os.rename(tmp_snap_path, snap_path)
+        os.replace(tmp_snap_path, snap_path)
         if self._delete_previous_snaphots:
             snap_dir = os.path.join(self.output_dir, my_paths.snapshot_dir)
             for f in os.listdir(snap_dir):
@@ -1059,7 +1395,7 @@ class EcalMonitoring:
                 if f.startswith("202") and os.path.isfile(f_path):
                     os.remove(f_path)
         self.logger.debug(
-            f"🔎A new monitoring snapshot is ready: {snap_name} at {snap_path}"
+            "🔎A new monitoring snapshot is ready: %s at %s", snap_name, snap_path
         )
         return snap_path
 